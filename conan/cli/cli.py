@@ -1,24 +1,152 @@
+import functools
 import importlib
+import importlib.util
+import json
 import os
 import pkgutil
 import re
 import signal
 import sys
+import tempfile
 import textwrap
 import traceback
 from collections import defaultdict
-from difflib import get_close_matches
-from inspect import getmembers
 
-from conan.api.conan_api import ConanAPI
+try:  # Optional, compiled drop-in replacement of difflib
+    from cydifflib import get_close_matches
+except ImportError:
+    from difflib import get_close_matches
+
 from conan.api.output import ConanOutput, Color, cli_out_write, LEVEL_TRACE
 from conan.cli.command import ConanSubCommand
 from conan.cli.exit_codes import SUCCESS, ERROR_MIGRATION, ERROR_GENERAL, USER_CTRL_C, \
     ERROR_SIGTERM, USER_CTRL_BREAK, ERROR_INVALID_CONFIGURATION, ERROR_UNEXPECTED
 from conans import __version__ as client_version
-from conans.client.cache.cache import ClientCache
 from conan.errors import ConanException, ConanInvalidConfiguration, ConanMigrationError
-from conans.util.files import exception_message_safe
+from conans.util.files import exception_message_safe, load
+
+
+_EXCEPTION_EXIT_CODES = {ConanInvalidConfiguration: ERROR_INVALID_CONFIGURATION,
+                         ConanException: ERROR_GENERAL}
+
+
+@functools.lru_cache(maxsize=None)
+def _short_help(doc, indent):
+    """ The summary of a command for the help output, all the lines of the docstring up to the
+    first empty one
+    """
+    start = False
+    data = []
+    for line in doc.split('\n'):
+        line = line.strip()
+        if not line:
+            if start:
+                break
+            start = True
+            continue
+        data.append(line)
+    return textwrap.fill(' '.join(data), 80, subsequent_indent=" " * indent)
+
+
+def _add_sys_path(folder):
+    if folder not in sys.path:
+        sys.path.append(folder)
+
+
+def _import_from_folder(import_path, folder):
+    """ Imports the module directly with the finder of the folder that contains it, instead of
+    searching for it in every sys.path entry
+    """
+    module = sys.modules.get(import_path)
+    if module is None:
+        spec = pkgutil.get_importer(folder).find_spec(import_path)
+        if spec is None:  # e.g. removed since the folder was scanned
+            raise ModuleNotFoundError(f"No module named '{import_path}'", name=import_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[import_path] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[import_path]
+            raise
+    return module
+
+
+def _scan_modules(folder):
+    return [module.name for module in pkgutil.iter_modules([folder])]
+
+
+@functools.lru_cache(maxsize=16)
+def _discover_modules(folder, mtime, entries):
+    """ In-process cache of the folders scans, shared by different Conan homes (the built-in
+    commands folder is always the same). The mtime and number of entries are part of the key to
+    scan modified folders again
+    """
+    return tuple(_scan_modules(folder))
+
+
+class _CommandModulesCache:
+    """ Persists the names of the modules found in the commands folders, so they are not scanned
+    again in every invocation while the folders are not modified.
+
+    A folder is considered modified if its mtime or its number of entries changed. The number of
+    entries covers files added in the same mtime tick of a previous scan in filesystems with
+    coarse timestamps, but renaming a file in that same tick still goes unnoticed until the
+    folder changes again
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._folders = self._load(path)
+        self._modified = False
+
+    @staticmethod
+    def _load(path):
+        """ Anything unexpected in the file is just a cache miss, it will be computed again
+        """
+        try:
+            folders = json.loads(load(path))
+        except (OSError, ValueError):  # Not created yet or corrupted
+            return {}
+        if not isinstance(folders, dict):
+            return {}
+        return {folder: cached for folder, cached in folders.items()
+                if isinstance(cached, dict) and "mtime" in cached
+                and isinstance(cached.get("names"), list)
+                and all(isinstance(name, str) for name in cached["names"])}
+
+    def modules(self, folder):
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+            entries = len(os.listdir(folder))
+        except OSError:  # Not a real folder, e.g. commands inside a frozen or zipped package
+            return _scan_modules(folder)
+        cached = self._folders.get(folder)
+        if cached is None or cached["mtime"] != mtime or cached.get("entries") != entries:
+            names = list(_discover_modules(folder, mtime, entries))
+            cached = self._folders[folder] = {"mtime": mtime, "entries": entries, "names": names}
+            self._modified = True
+        return cached["names"]
+
+    def save(self):
+        """ Best effort, a read-only or shared Conan home just won't have the cache. Written to a
+        temporary file and renamed, so concurrent invocations never read a partial file
+        """
+        if not self._modified:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path))
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(self._folders))
+            os.replace(tmp_path, self._path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
 
 class Cli:
@@ -28,58 +156,68 @@ class Cli:
     """
 
     def __init__(self, conan_api):
+        from conan.api.conan_api import ConanAPI
         assert isinstance(conan_api, ConanAPI), \
             "Expected 'Conan' type, got '{}'".format(type(conan_api))
         self._conan_api = conan_api
-        self._groups = defaultdict(list)
         self._commands = {}
 
     def _add_commands(self):
+        from conans.client.cache.cache import ClientCache
+        client_cache = ClientCache(self._conan_api.cache_folder)
+        modules_cache = _CommandModulesCache(client_cache.command_modules_cache_path)
         conan_commands_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commands")
-        for module in pkgutil.iter_modules([conan_commands_path]):
-            module_name = module[1]
-            self._add_command("conan.cli.commands.{}".format(module_name), module_name)
-
-        custom_commands_path = ClientCache(self._conan_api.cache_folder).custom_commands_path
-        if not os.path.isdir(custom_commands_path):
-            return
-
-        sys.path.append(custom_commands_path)
-        for module in pkgutil.iter_modules([custom_commands_path]):
-            module_name = module[1]
+        for module_name in modules_cache.modules(conan_commands_path):
+            # Built-in commands are only imported when they are going to be used, just keep
+            # the import information, the command name can be deduced from the module name
+            import_path = "conan.cli.commands.{}".format(module_name)
+            self._commands[module_name.replace("_", "-")] = (import_path, module_name)
+
+        custom_commands_path = client_cache.custom_commands_path
+        if os.path.isdir(custom_commands_path):
+            self._add_custom_commands(custom_commands_path, modules_cache)
+        modules_cache.save()
+
+    def _add_custom_commands(self, custom_commands_path, modules_cache):
+        # Still necessary in sys.path to allow custom commands importing their own modules
+        _add_sys_path(custom_commands_path)
+        for module_name in modules_cache.modules(custom_commands_path):
             if module_name.startswith("cmd_"):
                 try:
-                    self._add_command(module_name, module_name.replace("cmd_", ""))
+                    self._add_command(module_name, module_name.replace("cmd_", ""),
+                                      folder=custom_commands_path)
                 except Exception as e:
                     ConanOutput().error("Error loading custom command "
                                         "'{}.py': {}".format(module_name, e))
         # layers
         for folder in os.listdir(custom_commands_path):
             layer_folder = os.path.join(custom_commands_path, folder)
-            sys.path.append(layer_folder)
             if not os.path.isdir(layer_folder):
                 continue
-            for module in pkgutil.iter_modules([layer_folder]):
-                module_name = module[1]
+            _add_sys_path(layer_folder)
+            for module_name in modules_cache.modules(layer_folder):
                 if module_name.startswith("cmd_"):
                     module_path = f"{folder}.{module_name}"
                     try:
                         self._add_command(module_path, module_name.replace("cmd_", ""),
-                                          package=folder)
+                                          package=folder, folder=layer_folder)
                     except Exception as e:
                         ConanOutput().error(f"Error loading custom command {module_path}: {e}")
 
-    def _add_command(self, import_path, method_name, package=None):
-        try:
+    def _add_command(self, import_path, method_name, package=None, folder=None):
+        if folder is None:
             imported_module = importlib.import_module(import_path)
+        else:
+            imported_module = _import_from_folder(import_path, folder)
+        try:
             command_wrapper = getattr(imported_module, method_name)
             if command_wrapper.doc:
                 name = f"{package}:{command_wrapper.name}" if package else command_wrapper.name
                 self._commands[name] = command_wrapper
-                self._groups[command_wrapper.group].append(name)
-            for name, value in getmembers(imported_module):
+            subcommand_prefix = "{}_".format(method_name)
+            for name, value in vars(imported_module).items():
                 if isinstance(value, ConanSubCommand):
-                    if name.startswith("{}_".format(method_name)):
+                    if name.startswith(subcommand_prefix):
                         command_wrapper.add_subcommand(value)
                     else:
                         raise ConanException("The name for the subcommand method should "
@@ -89,6 +227,26 @@ class Cli:
             raise ConanException("There is no {} method defined in {}".format(method_name,
                                                                               import_path))
 
+    def _get_command(self, name):
+        """ Returns the command registered with that name, importing it first if it is a
+        built-in command that has not been loaded yet
+        """
+        command = self._commands[name]
+        if isinstance(command, tuple):
+            import_path, method_name = command
+            self._add_command(import_path, method_name)
+            command = self._commands[name]
+            if isinstance(command, tuple):
+                raise ConanException("The command defined in {} must be named '{}', as its "
+                                     "module".format(import_path, name))
+        return command
+
+    def _load_commands(self):
+        """ Imports all the lazy built-in commands, necessary to know their groups and docs
+        """
+        for name in list(self._commands):
+            self._get_command(name)
+
     def _print_similar(self, command):
         """ Looks for similar commands and prints them if found.
         """
@@ -113,61 +271,54 @@ class Cli:
         """
         Prints a summary of all commands.
         """
-        max_len = max((len(c) for c in self._commands)) + 1
+        self._load_commands()
+        # Only computed in the help path, not for every dispatched command
+        max_len = max(len(c) for c in self._commands) + 1
         line_format = '{{: <{}}}'.format(max_len)
 
-        for group_name, comm_names in sorted(self._groups.items()):
+        # Built from the registration order, so built-in commands are listed before custom ones
+        groups = defaultdict(list)
+        for name, command in self._commands.items():
+            groups[command.group].append((name, command))
+
+        for group_name, group_commands in sorted(groups.items()):
             cli_out_write("\n" + group_name + " commands", Color.BRIGHT_MAGENTA)
-            for name in comm_names:
+            for name, command in group_commands:
                 # future-proof way to ensure tabular formatting
                 cli_out_write(line_format.format(name), Color.GREEN, endline="")
 
-                # Help will be all the lines up to the first empty one
-                docstring_lines = self._commands[name].doc.split('\n')
-                start = False
-                data = []
-                for line in docstring_lines:
-                    line = line.strip()
-                    if not line:
-                        if start:
-                            break
-                        start = True
-                        continue
-                    data.append(line)
-
-                txt = textwrap.fill(' '.join(data), 80, subsequent_indent=" " * (max_len + 2))
-                cli_out_write(txt)
+                cli_out_write(_short_help(command.doc, max_len + 2))
 
         cli_out_write("")
         cli_out_write('Type "conan <command> -h" for help', Color.BRIGHT_MAGENTA)
 
     def run(self, *args):
         """ Entry point for executing commands, dispatcher to class
-        methods
+        methods. Returns the exit code, unless the command raises
         """
-        output = ConanOutput()
         self._add_commands()
         try:
             command_argument = args[0][0]
         except IndexError:  # No parameters
             self._output_help_cli()
-            return
-        try:
-            command = self._commands[command_argument]
-        except KeyError as exc:
+            return SUCCESS
+        if command_argument not in self._commands:
             if command_argument in ["-v", "--version"]:
                 cli_out_write("Conan version %s" % client_version, fg=Color.BRIGHT_GREEN)
-                return
+                return SUCCESS
 
             if command_argument in ["-h", "--help"]:
                 self._output_help_cli()
-                return
+                return SUCCESS
 
+            output = ConanOutput()
             output.info("'%s' is not a Conan command. See 'conan --help'." % command_argument)
             output.info("")
             self._print_similar(command_argument)
-            raise ConanException("Unknown command %s" % str(exc))
+            output.error("Unknown command '%s'" % command_argument)
+            return ERROR_GENERAL
 
+        command = self._get_command(command_argument)
         try:
             command.run(self._conan_api, args[0][1:])
         except Exception as e:
@@ -176,6 +327,7 @@ class Cli:
                 print(traceback.format_exc(), file=sys.stderr)
             self._conan2_migrate_recipe_msg(e)
             raise
+        return SUCCESS
 
     @staticmethod
     def _conan2_migrate_recipe_msg(exception):
@@ -207,12 +359,12 @@ class Cli:
         output = ConanOutput()
         if exception is None:
             return SUCCESS
-        if isinstance(exception, ConanInvalidConfiguration):
-            output.error(exception)
-            return ERROR_INVALID_CONFIGURATION
-        if isinstance(exception, ConanException):
-            output.error(exception)
-            return ERROR_GENERAL
+        # The most derived exception class with a registered exit code wins
+        for exception_type in type(exception).__mro__:
+            exit_code = _EXCEPTION_EXIT_CODES.get(exception_type)
+            if exit_code is not None:
+                output.error(exception)
+                return exit_code
         if isinstance(exception, SystemExit):
             if exception.code != 0:
                 output.error("Exiting with code: %d" % exception.code)
@@ -239,7 +391,13 @@ def main(args):
         5: SIGTERM
         6: Invalid configuration (done)
     """
+    if args and args[0] in ("-v", "--version"):
+        # It doesn't need the Conan API at all, avoid its expensive initialization
+        cli_out_write("Conan version %s" % client_version, fg=Color.BRIGHT_GREEN)
+        sys.exit(SUCCESS)
 
+    # Imported here, so the CLI entry point can be loaded without loading the whole Conan engine
+    from conan.api.conan_api import ConanAPI
     try:
         conan_api = ConanAPI()
     except ConanMigrationError:  # Error migrating
@@ -267,9 +425,8 @@ def main(args):
         signal.signal(signal.SIGBREAK, ctrl_break_handler)
 
     cli = Cli(conan_api)
-    error = SUCCESS
     try:
-        cli.run(args)
+        error = cli.run(args)
     except BaseException as e:
         error = cli.exception_exit_error(e)
     sys.exit(error)
@@ -29,6 +29,7 @@ PROFILES_FOLDER = "profiles"
 EXTENSIONS_FOLDER = "extensions"
 HOOKS_EXTENSION_FOLDER = "hooks"
 PLUGINS_FOLDER = "plugins"
+COMMAND_MODULES_CACHE = ".command_modules.json"
 
 
 # TODO: Rename this to ClientHome
@@ -198,6 +199,10 @@ class ClientCache(object):
     def custom_commands_path(self):
         return os.path.join(self.cache_folder, EXTENSIONS_FOLDER, "commands")
 
+    @property
+    def command_modules_cache_path(self):
+        return os.path.join(self.cache_folder, COMMAND_MODULES_CACHE)
+
     @property
     def custom_generators_path(self):
         return os.path.join(self.cache_folder, EXTENSIONS_FOLDER, "generators")
@@ -1,3 +1,9 @@
+import os
+import textwrap
+
+import pytest
+
+from conan.cli.cli import main
 from conans import __version__
 from conans.test.utils.tools import TestClient
 
@@ -9,10 +15,18 @@ class TestHelp:
         c.run("--version")
         assert "Conan version %s" % __version__ in c.out
 
+    @pytest.mark.parametrize("arg", ["-v", "--version"])
+    def test_version_main(self, arg, capsys):
+        with pytest.raises(SystemExit) as exc:
+            main([arg])
+        assert exc.value.code == 0
+        assert "Conan version %s" % __version__ in capsys.readouterr().out
+
     def test_unknown_command(self):
         c = TestClient()
         c.run("some_unknown_command123", assert_error=True)
         assert "'some_unknown_command123' is not a Conan command" in c.out
+        assert "ERROR: Unknown command 'some_unknown_command123'" in c.out
 
     def test_similar(self):
         c = TestClient()
@@ -26,6 +40,27 @@ class TestHelp:
         assert "Creator commands" in c.out
         assert "Consumer commands" in c.out
 
+    def test_help_custom_command_order(self):
+        """ custom commands are listed after the built-in ones of the same group
+        """
+        mycommand = textwrap.dedent("""
+            from conan.cli.command import conan_command
+
+            @conan_command(group="Consumer")
+            def mycommand(conan_api, parser, *args, **kwargs):
+                '''
+                My custom consumer command
+                '''
+            """)
+        c = TestClient()
+        c.save({os.path.join(c.cache_folder, "extensions", "commands", "cmd_mycommand.py"):
+                mycommand})
+        c.run("-h")
+        names = [line.split()[0] for line in c.out.splitlines() if line.strip()]
+        consumer = names[names.index("Consumer") + 1:names.index("Creator")]
+        assert "install" in consumer
+        assert consumer[-1] == "mycommand"
+
     def test_help_command(self):
         c = TestClient()
         c.run("new -h")
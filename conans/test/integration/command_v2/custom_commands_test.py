@@ -254,3 +254,56 @@ class TestCustomCommands:
         client.run("danimtb:mycommand")
         foldername = os.path.basename(client.cache_folder)
         assert f'Conan cache folder from cmd_mycode: {foldername}' in client.out
+
+    def test_custom_command_added_after_run(self):
+        """ the discovered command modules are cached, but a new command must be found
+        """
+        mycommand = textwrap.dedent("""
+            from conan.api.output import cli_out_write
+            from conan.cli.command import conan_command
+
+            @conan_command(group="custom commands")
+            def {0}(conan_api, parser, *args, **kwargs):
+                '''
+                My {0} doc
+                '''
+                cli_out_write("Hello {0}!")
+            """)
+
+        client = TestClient()
+        commands_path = os.path.join(client.cache_folder, 'extensions', 'commands')
+        client.save({os.path.join(commands_path, 'cmd_hello.py'): mycommand.format("hello")})
+        client.run("hello")
+        assert "Hello hello!" in client.out
+        client.save({os.path.join(commands_path, 'cmd_bye.py'): mycommand.format("bye")})
+        client.run("bye")
+        assert "Hello bye!" in client.out
+
+    def test_custom_command_renamed_same_mtime(self):
+        """ the cached module names can be stale if the folder mtime didn't change, the missing
+        module must be reported as such
+        """
+        mycommand = textwrap.dedent("""
+            from conan.api.output import cli_out_write
+            from conan.cli.command import conan_command
+
+            @conan_command(group="custom commands")
+            def hello(conan_api, parser, *args, **kwargs):
+                '''
+                My hello doc
+                '''
+                cli_out_write("Hello world!")
+            """)
+
+        client = TestClient()
+        commands_path = os.path.join(client.cache_folder, 'extensions', 'commands')
+        client.save({os.path.join(commands_path, 'cmd_hello.py'): mycommand})
+        client.run("hello")
+        assert "Hello world!" in client.out
+        mtime_ns = os.stat(commands_path).st_mtime_ns
+        os.rename(os.path.join(commands_path, 'cmd_hello.py'),
+                  os.path.join(commands_path, 'cmd_hola.py'))
+        os.utime(commands_path, ns=(mtime_ns, mtime_ns))
+        client.run("list *")
+        assert "ERROR: Error loading custom command 'cmd_hello.py': " \
+               "No module named 'cmd_hello'" in client.out
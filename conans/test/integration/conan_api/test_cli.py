@@ -1,8 +1,16 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
 from conan.api.conan_api import ConanAPI
 from conan.cli.cli import Cli
+from conan.errors import ConanException
 from conans.test.utils.mocks import RedirectedTestOutput
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import redirect_output
+from conans.util.files import save
 
 
 def test_cli():
@@ -21,3 +29,78 @@ def test_cli():
         cli.run(["list", "*"])
         cli2.run(["list", "*"])
         cli.run(["list", "*"])
+
+
+def test_cli_lazy_commands():
+    """ built-in commands are only imported when they are going to be executed
+    """
+    folder = temp_folder()
+    api = ConanAPI(cache_folder=folder)
+    sys.modules.pop("conan.cli.commands.upload", None)
+
+    stdout = RedirectedTestOutput()
+    stderr = RedirectedTestOutput()
+    with redirect_output(stderr, stdout):
+        Cli(api).run(["list", "*"])
+    assert "conan.cli.commands.upload" not in sys.modules
+
+
+def test_cli_custom_commands_sys_path():
+    """ reusing the Cli doesn't keep appending the custom commands folders to sys.path
+    """
+    folder = temp_folder()
+    commands_path = os.path.join(folder, "extensions", "commands")
+    save(os.path.join(commands_path, "mylayer", "cmd_hello.py"), textwrap.dedent("""
+        from conan.api.output import cli_out_write
+        from conan.cli.command import conan_command
+
+        @conan_command()
+        def hello(conan_api, parser, *args, **kwargs):
+            '''
+            My Hello doc
+            '''
+            cli_out_write("Hello world!")
+        """))
+    api = ConanAPI(cache_folder=folder)
+    cli = Cli(api)
+
+    old_path = sys.path[:]
+    stdout = RedirectedTestOutput()
+    stderr = RedirectedTestOutput()
+    try:
+        with redirect_output(stderr, stdout):
+            cli.run(["mylayer:hello"])
+            cli.run(["mylayer:hello"])
+        assert "Hello world!" in stdout.getvalue()
+        assert sys.path.count(commands_path) == 1
+        assert sys.path.count(os.path.join(commands_path, "mylayer")) == 1
+    finally:
+        sys.path = old_path
+        sys.modules.pop("mylayer.cmd_hello", None)
+
+
+def test_cli_lazy_command_wrong_name():
+    """ the lazy built-in commands are registered with the name of their module, a command
+    defined with a different name is an error, not a broken entry
+    """
+    folder = temp_folder()
+    save(os.path.join(folder, "mymodule.py"), textwrap.dedent("""
+        from conan.cli.command import conan_command
+
+        def other(conan_api, parser, *args, **kwargs):
+            '''
+            My other doc
+            '''
+
+        mymodule = conan_command()(other)
+        """))
+    cli = Cli(ConanAPI(cache_folder=temp_folder()))
+    cli._commands["mymodule"] = ("mymodule", "mymodule")
+    sys.path.append(folder)
+    try:
+        with pytest.raises(ConanException, match="The command defined in mymodule must be "
+                                                 "named 'mymodule'"):
+            cli._get_command("mymodule")
+    finally:
+        sys.path.remove(folder)
+        sys.modules.pop("mymodule", None)
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from conan.cli.cli import _CommandModulesCache
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+def test_not_a_folder():
+    """ e.g. the built-in commands inside a frozen or zipped Conan, there is nothing to stat
+    """
+    folder = temp_folder()
+    cache = _CommandModulesCache(os.path.join(folder, "cache.json"))
+    assert cache.modules(os.path.join(folder, "missing")) == []
+    cache.save()
+    assert not os.listdir(folder)
+
+
+def test_new_module_same_mtime():
+    """ coarse mtime filesystems can add a new file without changing the folder mtime
+    """
+    folder = temp_folder()
+    commands = os.path.join(folder, "commands")
+    cache_path = os.path.join(folder, "cache.json")
+    save(os.path.join(commands, "cmd_hello.py"), "")
+    cache = _CommandModulesCache(cache_path)
+    assert cache.modules(commands) == ["cmd_hello"]
+    cache.save()
+
+    mtime_ns = os.stat(commands).st_mtime_ns
+    save(os.path.join(commands, "cmd_bye.py"), "")
+    os.utime(commands, ns=(mtime_ns, mtime_ns))
+    cache = _CommandModulesCache(cache_path)
+    assert sorted(cache.modules(commands)) == ["cmd_bye", "cmd_hello"]
+
+
+def test_save_failure_is_not_an_error():
+    folder = temp_folder()
+    save(os.path.join(folder, "commands", "cmd_hello.py"), "")
+    # The parent of the cache file is a file, it can never be written
+    save(os.path.join(folder, "file"), "")
+    cache = _CommandModulesCache(os.path.join(folder, "file", "cache.json"))
+    assert cache.modules(os.path.join(folder, "commands")) == ["cmd_hello"]
+    cache.save()
+
+
+@pytest.mark.parametrize("content", ["[]", '{"<folder>": {}}', '{"<folder>": {"mtime": 1}}',
+                                     '{"<folder>": {"mtime": 1, "names": [1]}}'])
+def test_unexpected_cache_content(content):
+    """ a valid json with an unexpected shape is a cache miss, not an error
+    """
+    folder = temp_folder()
+    commands = os.path.join(folder, "commands")
+    cache_path = os.path.join(folder, "cache.json")
+    save(os.path.join(commands, "cmd_hello.py"), "")
+    save(cache_path, content.replace("<folder>", commands.replace("\\", "\\\\")))
+    cache = _CommandModulesCache(cache_path)
+    assert cache.modules(commands) == ["cmd_hello"]
@@ -24,7 +24,11 @@ from mock import Mock
 from requests.exceptions import HTTPError
 from webtest.app import TestApp
 
-from conan.cli.exit_codes import SUCCESS
+try:  # Optional, faster parsing of the json output of the commands
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from conan.internal.cache.cache import PackageLayout, RecipeLayout
 from conans import REVISIONS
 from conan.api.conan_api import ConanAPI
@@ -426,6 +430,13 @@ class TestClient(object):
     def load(self, filename):
         return load(os.path.join(self.current_folder, filename))
 
+    def clean_workspace(self):
+        """ Removes all the contents of the current folder, but not the cache, so the client
+        can be reused from a clean folder
+        """
+        shutil.rmtree(self.current_folder)
+        mkdir(self.current_folder)
+
     @property
     def cache(self):
         # Returns a temporary cache object intended for inspecting it
@@ -492,10 +503,9 @@ class TestClient(object):
         self.api = ConanAPI(cache_folder=self.cache_folder)
         command = Cli(self.api)
 
-        error = SUCCESS
         trace = None
         try:
-            command.run(args)
+            error = command.run(args)
         except BaseException as e:  # Capture all exceptions as argparse
             trace = traceback.format_exc()
             error = command.exception_exit_error(e)